@@ -79,10 +79,11 @@ st.session_state.user_settings["notifications"] = notifications
 st.write("Current settings:", st.session_state.user_settings)
 
 # Show the raw session state
+# (a checkbox rather than an expander: expander bodies run even while collapsed)
 st.write("---")
-with st.expander("🔍 Raw Session State Contents"):
+if st.checkbox("🔍 Show raw session state"):
     st.write("Here's everything in your session state:")
-    st.json(dict(st.session_state))
+    st.json({k: st.session_state[k] for k in st.session_state})
 
 # Teaching notes
 with st.expander("🎓 Teaching Notes"):
@@ -11,6 +11,15 @@ Key Teaching Points:
 import streamlit as st
 import time
 import random
+from itertools import chain
+
+# Demo reply templates; only the one picked for a turn gets formatted
+_RESPONSES = (
+    "I received your message: '{}' - that's interesting!",
+    "You said: '{}'. I'm just a demo, but that sounds great!",
+    "Thanks for the message: '{}'. In a real app, I'd give you a smart response!",
+    "'{}' - I hear you! This is how chat interfaces work in Streamlit."
+)
 
 st.title("💬 Chat Interface Components")
 
@@ -19,15 +28,38 @@ Modern AI applications need chat-style interfaces. Streamlit provides
 specialized components that make this easy and professional-looking.
 """)
 
-# Initialize chat history
+# Initialize chat history (the greeting is pinned separately from the history)
 if "chat_messages" not in st.session_state:
-    st.session_state.chat_messages = [
-        {"role": "assistant", "content": "Hello! I'm your demo assistant. Try sending me a message!"}
-    ]
+    st.session_state.chat_greeting = {"role": "assistant", "content": "Hello! I'm your demo assistant. Try sending me a message!"}
+    st.session_state.chat_messages = []
+
+# Running totals for the metrics, updated whenever a message is added or cleared
+if "user_msg_count" not in st.session_state:
+    st.session_state.user_msg_count = 0
+    st.session_state.total_chars = len(st.session_state.chat_greeting["content"])
+
+def stream_response(text):
+    """Yield a response word by word to simulate token streaming"""
+    for word in text.split():
+        yield word + " "
+        time.sleep(0.02)
+
+def throttle(chunks, min_ms=50, min_chars=8):
+    """Batch streamed chunks so the browser gets at most one update per ~50ms"""
+    buffer = ""
+    last_flush = float("-inf")  # let the first chunk through immediately
+    for chunk in chunks:
+        buffer += chunk
+        if len(buffer) >= min_chars and (time.monotonic() - last_flush) * 1000 >= min_ms:
+            yield buffer
+            buffer = ""
+            last_flush = time.monotonic()
+    if buffer:
+        yield buffer
 
 # Display existing chat messages
 st.subheader("Chat Display")
-for message in st.session_state.chat_messages:
+for message in chain([st.session_state.chat_greeting], st.session_state.chat_messages):
     with st.chat_message(message["role"]):
         st.write(message["content"])
 
@@ -35,6 +67,8 @@ for message in st.session_state.chat_messages:
 if prompt := st.chat_input("Type your message here..."):
     # Add user message to history
     st.session_state.chat_messages.append({"role": "user", "content": prompt})
+    st.session_state.user_msg_count += 1
+    st.session_state.total_chars += len(prompt)
 
     # Display user message immediately
     with st.chat_message("user"):
@@ -42,22 +76,20 @@ if prompt := st.chat_input("Type your message here..."):
 
     # Simulate assistant response
     with st.chat_message("assistant"):
-        # Show typing indicator
-        with st.spinner("Assistant is typing..."):
-            time.sleep(1)  # Simulate processing time
-
         # Generate a simple demo response
-        responses = [
-            f"I received your message: '{prompt}' - that's interesting!",
-            f"You said: '{prompt}'. I'm just a demo, but that sounds great!",
-            f"Thanks for the message: '{prompt}'. In a real app, I'd give you a smart response!",
-            f"'{prompt}' - I hear you! This is how chat interfaces work in Streamlit."
-        ]
-        response = random.choice(responses)
-        st.write(response)
+        response = random.choice(_RESPONSES).format(prompt)
+
+        # Stream the reply into a single placeholder so only this bubble updates;
+        # the streamed text is display-only, history keeps the original reply
+        placeholder = st.empty()
+        streamed = ""
+        for chunk in throttle(stream_response(response)):
+            streamed += chunk
+            placeholder.markdown(streamed)
 
         # Add assistant response to history
         st.session_state.chat_messages.append({"role": "assistant", "content": response})
+        st.session_state.total_chars += len(response)
 
 # Chat controls
 st.write("---")
@@ -65,17 +97,16 @@ col1, col2, col3 = st.columns(3)
 
 with col1:
     if st.button("Clear Chat"):
-        st.session_state.chat_messages = [
-            {"role": "assistant", "content": "Chat cleared! Send me a new message."}
-        ]
+        st.session_state.chat_messages.clear()
+        st.session_state.chat_greeting = {"role": "assistant", "content": "Chat cleared! Send me a new message."}
+        st.session_state.user_msg_count = 0
+        st.session_state.total_chars = len(st.session_state.chat_greeting["content"])
 
 with col2:
-    message_count = len([msg for msg in st.session_state.chat_messages if msg["role"] == "user"])
-    st.metric("Messages Sent", message_count)
+    st.metric("Messages Sent", st.session_state.user_msg_count)
 
 with col3:
-    total_chars = sum(len(msg["content"]) for msg in st.session_state.chat_messages)
-    st.metric("Total Characters", total_chars)
+    st.metric("Total Characters", st.session_state.total_chars)
 
 # Component showcase
 st.write("---")
@@ -10,6 +10,39 @@ Key Teaching Points:
 
 import streamlit as st
 
+# Option lists and lookups are constant, so build them once at import time
+_MODELS = ("GPT-3.5", "GPT-4", "Claude", "Llama 2")
+_MODEL_INDEX = {model: i for i, model in enumerate(_MODELS)}
+_THEMES = ("Light", "Dark", "Auto")
+_THEME_INDEX = {theme: i for i, theme in enumerate(_THEMES)}
+_MODEL_INFO = {
+    "GPT-3.5": "Fast, efficient, good for most tasks",
+    "GPT-4": "Most capable, slower, higher cost",
+    "Claude": "Great for analysis and reasoning",
+    "Llama 2": "Open source, good performance"
+}
+_RATE_PER_TOKEN = {"GPT-3.5": 0.002, "GPT-4": 0.06, "Claude": 0.01, "Llama 2": 0.0}
+
+# Per temperature bucket (focused, balanced, creative): demo reply and mode indicator
+_TEMPERATURE_RESPONSES = (
+    "Artificial intelligence (AI) refers to the simulation of human intelligence in machines programmed to think and learn.",
+    "AI is like giving computers a brain! It's the fascinating field where we teach machines to think, reason, and solve problems just like humans do.",
+    "🤖 Ah, artificial intelligence! It's the magical realm where silicon dreams meet algorithmic poetry, creating digital minds that dance with data!"
+)
+_TEMPERATURE_MODES = (
+    (st.info, "🎯 **Focused Mode**: Responses will be precise and factual"),
+    (st.info, "⚖️ **Balanced Mode**: Mix of creativity and accuracy"),
+    (st.warning, "🎨 **Creative Mode**: Responses will be very creative but potentially less accurate")
+)
+
+
+def build_settings_table(settings):
+    """Build the payload shown by st.table for the given settings"""
+    return {
+        "Setting": list(settings.keys()),
+        "Value": list(settings.values())
+    }
+
 # Configure page
 st.set_page_config(page_title="Sidebar Demo", page_icon="⚙️", layout="wide")
 
@@ -31,6 +64,10 @@ if "app_settings" not in st.session_state:
         "show_debug": False
     }
 
+# Cached table payload, rebuilt only when settings are saved or reset
+if "settings_table" not in st.session_state:
+    st.session_state.settings_table = build_settings_table(st.session_state.app_settings)
+
 # Sidebar configuration
 with st.sidebar:
     st.header("🎛️ App Configuration")
@@ -38,8 +75,8 @@ with st.sidebar:
     # Model selection
     model_choice = st.selectbox(
         "Choose AI Model:",
-        ["GPT-3.5", "GPT-4", "Claude", "Llama 2"],
-        index=["GPT-3.5", "GPT-4", "Claude", "Llama 2"].index(st.session_state.app_settings["model"])
+        _MODELS,
+        index=_MODEL_INDEX[st.session_state.app_settings["model"]]
     )
 
     # Temperature slider
@@ -64,8 +101,8 @@ with st.sidebar:
     # Theme selection
     theme = st.radio(
         "App Theme:",
-        ["Light", "Dark", "Auto"],
-        index=["Light", "Dark", "Auto"].index(st.session_state.app_settings["theme"])
+        _THEMES,
+        index=_THEME_INDEX[st.session_state.app_settings["theme"]]
     )
 
     # Debug mode
@@ -78,14 +115,19 @@ with st.sidebar:
 
     # Action buttons
     if st.button("💾 Save Settings", type="primary"):
-        st.session_state.app_settings.update({
+        new_settings = {
             "theme": theme,
             "model": model_choice,
             "temperature": temperature,
             "max_tokens": max_tokens,
             "show_debug": show_debug
-        })
-        st.success("Settings saved!")
+        }
+        if new_settings != st.session_state.app_settings:
+            st.session_state.app_settings = new_settings
+            st.session_state.settings_table = build_settings_table(new_settings)
+            st.success("Settings saved!")
+        else:
+            st.info("No changes to save.")
 
     if st.button("🔄 Reset to Defaults"):
         st.session_state.app_settings = {
@@ -95,6 +137,7 @@ with st.sidebar:
             "max_tokens": 150,
             "show_debug": False
         }
+        st.session_state.settings_table = build_settings_table(st.session_state.app_settings)
         st.success("Settings reset!")
         st.rerun()
 
@@ -109,18 +152,16 @@ with st.sidebar:
         """)
 
 # Main content area
+temperature_value = st.session_state.app_settings["temperature"]
+temperature_bucket = 0 if temperature_value < 0.5 else 1 if temperature_value < 1.0 else 2
+
 col1, col2 = st.columns([2, 1])
 
 with col1:
     st.subheader("📋 Current Configuration")
 
     # Display current settings in a nice format
-    settings_df = {
-        "Setting": list(st.session_state.app_settings.keys()),
-        "Value": list(st.session_state.app_settings.values())
-    }
-
-    st.table(settings_df)
+    st.table(st.session_state.settings_table)
 
     # Simulated chat based on settings
     st.subheader("💬 Simulated Chat Response")
@@ -130,50 +171,23 @@ with col1:
         st.write("Tell me about artificial intelligence")
 
     with st.chat_message("assistant"):
-        if st.session_state.app_settings["temperature"] < 0.5:
-            response = "Artificial intelligence (AI) refers to the simulation of human intelligence in machines programmed to think and learn."
-        elif st.session_state.app_settings["temperature"] < 1.0:
-            response = "AI is like giving computers a brain! It's the fascinating field where we teach machines to think, reason, and solve problems just like humans do."
-        else:
-            response = "🤖 Ah, artificial intelligence! It's the magical realm where silicon dreams meet algorithmic poetry, creating digital minds that dance with data!"
-
-        st.write(f"[Using {st.session_state.app_settings['model']} at temperature {st.session_state.app_settings['temperature']}]")
-        st.write(response)
+        st.write(f"[Using {st.session_state.app_settings['model']} at temperature {temperature_value}]")
+        st.write(_TEMPERATURE_RESPONSES[temperature_bucket])
 
 with col2:
     st.subheader("📊 Settings Impact")
 
     # Visual indicators based on settings
-    if st.session_state.app_settings["temperature"] < 0.5:
-        st.info("🎯 **Focused Mode**: Responses will be precise and factual")
-    elif st.session_state.app_settings["temperature"] < 1.0:
-        st.info("⚖️ **Balanced Mode**: Mix of creativity and accuracy")
-    else:
-        st.warning("🎨 **Creative Mode**: Responses will be very creative but potentially less accurate")
+    show_mode, mode_text = _TEMPERATURE_MODES[temperature_bucket]
+    show_mode(mode_text)
 
     # Model info
-    model_info = {
-        "GPT-3.5": "Fast, efficient, good for most tasks",
-        "GPT-4": "Most capable, slower, higher cost",
-        "Claude": "Great for analysis and reasoning",
-        "Llama 2": "Open source, good performance"
-    }
-
-    st.info(f"**{st.session_state.app_settings['model']}**: {model_info[st.session_state.app_settings['model']]}")
+    st.info(f"**{st.session_state.app_settings['model']}**: {_MODEL_INFO[st.session_state.app_settings['model']]}")
 
     # Token usage estimate
-    estimated_cost = {
-        "GPT-3.5": st.session_state.app_settings["max_tokens"] * 0.002,
-        "GPT-4": st.session_state.app_settings["max_tokens"] * 0.06,
-        "Claude": st.session_state.app_settings["max_tokens"] * 0.01,
-        "Llama 2": 0
-    }
-
-    cost = estimated_cost[st.session_state.app_settings['model']]
-    if cost > 0:
-        st.metric("Est. Cost per Response", f"${cost:.4f}")
-    else:
-        st.metric("Est. Cost per Response", "Free")
+    rate = _RATE_PER_TOKEN[st.session_state.app_settings['model']]
+    cost = rate * st.session_state.app_settings["max_tokens"]
+    st.metric("Est. Cost per Response", f"${cost:.4f}" if rate else "Free")
 
 # Debug panel (conditional)
 if st.session_state.app_settings["show_debug"]:
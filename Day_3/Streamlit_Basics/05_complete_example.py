@@ -11,7 +11,33 @@ Key Teaching Points:
 import streamlit as st
 import time
 import random
+from functools import partial
+from collections import deque
 from datetime import datetime
+from itertools import chain
+
+# Response style options and their selectbox positions, built once at import time
+_STYLES = ("Friendly", "Professional", "Creative")
+_STYLE_INDEX = {style: i for i, style in enumerate(_STYLES)}
+
+# Demo reply templates per style; only the chosen one gets formatted
+_RESPONSES = {
+    "Professional": (
+        "Thank you for your message regarding '{}'. I've processed your request and understand your query.",
+        "I acknowledge your input: '{}'. Please allow me to provide you with a comprehensive response.",
+        "Your inquiry about '{}' has been noted. I'm here to assist you with professional guidance."
+    ),
+    "Creative": (
+        "🎨 Wow! '{}' - that sparks so many creative possibilities! Let me paint you a picture with words...",
+        "✨ Your message '{}' is like a canvas waiting for artistic interpretation! Here's my creative take...",
+        "🌟 '{}' - what an inspiring prompt! Let me weave some creative magic around that idea..."
+    ),
+    "Friendly": (
+        "That's really interesting! You mentioned '{}' and I think that's a great topic to explore together! 😊",
+        "I love that you brought up '{}'! It's always exciting to chat about new things. Let me share my thoughts!",
+        "Hey, great question about '{}'! I'm happy to help you with that. Here's what I'm thinking..."
+    )
+}
 
 # Page configuration
 st.set_page_config(
@@ -25,7 +51,7 @@ st.set_page_config(
 def initialize_session_state():
     """Initialize all session state variables with defaults"""
     defaults = {
-        "messages": [{"role": "assistant", "content": "Hello! I'm your demo assistant. How can I help you today?"}],
+        "greeting": {"role": "assistant", "content": "Hello! I'm your demo assistant. How can I help you today?"},
         "settings": {
             "assistant_name": "Demo Assistant",
             "response_style": "Friendly",
@@ -42,49 +68,68 @@ def initialize_session_state():
         if key not in st.session_state:
             st.session_state[key] = value
 
+    # History excludes the pinned greeting; the deque evicts the oldest message itself
+    if "messages" not in st.session_state:
+        st.session_state.messages = deque(maxlen=st.session_state.settings["max_history"] - 1)
+
 # Initialize app
 initialize_session_state()
 
+# Read the clock once per rerun and share it across stats, captions and timestamps
+now = datetime.now()
+
 # Helper functions
-def add_message(role, content):
+def add_message(role, content, timestamp):
     """Add a message to chat history with timestamp"""
     message = {
         "role": role,
         "content": content,
-        "timestamp": datetime.now()
+        "timestamp": timestamp,
+        # Label is fixed at send time, so history keeps the name used back then
+        "role_display": "You" if role == "user" else st.session_state.settings["assistant_name"]
     }
+    # The deque's maxlen trims the oldest message once the history limit is reached
     st.session_state.messages.append(message)
 
-    # Trim history if too long
-    max_history = st.session_state.settings["max_history"]
-    if len(st.session_state.messages) > max_history:
-        # Keep first message (greeting) and trim from the middle
-        st.session_state.messages = [st.session_state.messages[0]] + st.session_state.messages[-(max_history-1):]
-
 def generate_response(user_input):
     """Generate a demo response based on settings"""
     style = st.session_state.settings["response_style"]
-
-    if style == "Professional":
-        responses = [
-            f"Thank you for your message regarding '{user_input}'. I've processed your request and understand your query.",
-            f"I acknowledge your input: '{user_input}'. Please allow me to provide you with a comprehensive response.",
-            f"Your inquiry about '{user_input}' has been noted. I'm here to assist you with professional guidance."
-        ]
-    elif style == "Creative":
-        responses = [
-            f"🎨 Wow! '{user_input}' - that sparks so many creative possibilities! Let me paint you a picture with words...",
-            f"✨ Your message '{user_input}' is like a canvas waiting for artistic interpretation! Here's my creative take...",
-            f"🌟 '{user_input}' - what an inspiring prompt! Let me weave some creative magic around that idea..."
-        ]
-    else:  # Friendly
-        responses = [
-            f"That's really interesting! You mentioned '{user_input}' and I think that's a great topic to explore together! 😊",
-            f"I love that you brought up '{user_input}'! It's always exciting to chat about new things. Let me share my thoughts!",
-            f"Hey, great question about '{user_input}'! I'm happy to help you with that. Here's what I'm thinking..."
-        ]
-
-    return random.choice(responses)
+    return random.choice(_RESPONSES[style]).format(user_input)
+
+def build_chat_export(greeting, messages, assistant_name, exported_at):
+    """Build the plain-text chat export (only called when the download starts).
+
+    Streamlit runs the builder on a worker thread without session state, so
+    everything it needs is passed in rather than read from st.session_state.
+    """
+    chat_export = f"Chat Export - {exported_at.strftime('%Y-%m-%d %H:%M')}\n"
+    chat_export += "=" * 50 + "\n\n"
+
+    for msg in chain([greeting], messages):
+        role = msg.get("role_display", assistant_name)
+        timestamp = msg.get("timestamp", exported_at).strftime("%H:%M")
+        chat_export += f"[{timestamp}] {role}: {msg['content']}\n\n"
+
+    return chat_export
+
+def stream_response(text):
+    """Yield a response word by word to simulate token streaming"""
+    for word in text.split():
+        yield word + " "
+        time.sleep(0.02)
+
+def throttle(chunks, min_ms=50, min_chars=8):
+    """Batch streamed chunks so the browser gets at most one update per ~50ms"""
+    buffer = ""
+    last_flush = float("-inf")  # let the first chunk through immediately
+    for chunk in chunks:
+        buffer += chunk
+        if len(buffer) >= min_chars and (time.monotonic() - last_flush) * 1000 >= min_ms:
+            yield buffer
+            buffer = ""
+            last_flush = time.monotonic()
+    if buffer:
+        yield buffer
 
 # Sidebar Configuration
 with st.sidebar:
@@ -99,8 +144,8 @@ with st.sidebar:
 
     response_style = st.selectbox(
         "Response Style:",
-        ["Friendly", "Professional", "Creative"],
-        index=["Friendly", "Professional", "Creative"].index(st.session_state.settings["response_style"])
+        _STYLES,
+        index=_STYLE_INDEX[st.session_state.settings["response_style"]]
     )
 
     # Chat settings
@@ -118,22 +163,28 @@ with st.sidebar:
         value=st.session_state.settings["show_timestamps"]
     )
 
-    # Update settings
-    st.session_state.settings.update({
+    # Resize the history buffer when the limit changes, keeping the newest messages
+    if max_history - 1 != st.session_state.messages.maxlen:
+        st.session_state.messages = deque(st.session_state.messages, maxlen=max_history - 1)
+
+    # Update settings only when a widget value actually changed
+    new_settings = {
         "assistant_name": assistant_name,
         "response_style": response_style,
         "max_history": max_history,
         "show_timestamps": show_timestamps
-    })
+    }
+    if new_settings != st.session_state.settings:
+        st.session_state.settings = new_settings
 
     st.divider()
 
     # Statistics
     st.subheader("📊 Session Stats")
-    session_duration = datetime.now() - st.session_state.stats["session_start"]
+    session_duration = now - st.session_state.stats["session_start"]
     st.metric("Session Duration", f"{session_duration.seconds // 60}m {session_duration.seconds % 60}s")
     st.metric("Messages Sent", st.session_state.stats["total_messages"])
-    st.metric("Total Messages", len(st.session_state.messages))
+    st.metric("Total Messages", len(st.session_state.messages) + 1)
 
     st.divider()
 
@@ -143,25 +194,27 @@ with st.sidebar:
 
     with col1:
         if st.button("🗑️ Clear Chat", type="secondary"):
-            st.session_state.messages = [
-                {"role": "assistant", "content": f"Hello! I'm {assistant_name}. Chat cleared - let's start fresh!"}
-            ]
+            st.session_state.greeting = {
+                "role": "assistant",
+                "content": f"Hello! I'm {assistant_name}. Chat cleared - let's start fresh!"
+            }
+            st.session_state.messages.clear()
             st.rerun()
 
     with col2:
         if st.button("📤 Export Chat", type="secondary"):
-            chat_export = f"Chat Export - {datetime.now().strftime('%Y-%m-%d %H:%M')}\n"
-            chat_export += "=" * 50 + "\n\n"
-
-            for msg in st.session_state.messages:
-                role = "You" if msg["role"] == "user" else assistant_name
-                timestamp = msg.get("timestamp", datetime.now()).strftime("%H:%M")
-                chat_export += f"[{timestamp}] {role}: {msg['content']}\n\n"
-
+            # Pass the builder itself so the export is only assembled on download;
+            # the chat is snapshotted now because the builder can't read session state
             st.download_button(
                 "💾 Download",
-                chat_export,
-                file_name=f"chat_export_{datetime.now().strftime('%Y%m%d_%H%M')}.txt",
+                partial(
+                    build_chat_export,
+                    st.session_state.greeting,
+                    tuple(st.session_state.messages),
+                    assistant_name,
+                    now
+                ),
+                file_name=f"chat_export_{now.strftime('%Y%m%d_%H%M')}.txt",
                 mime="text/plain"
             )
 
@@ -172,46 +225,45 @@ st.caption(f"Response Style: {response_style} | History Limit: {max_history} mes
 # Chat display
 chat_container = st.container()
 with chat_container:
-    for message in st.session_state.messages:
-        role_display = "You" if message["role"] == "user" else assistant_name
-
+    for message in chain([st.session_state.greeting], st.session_state.messages):
         with st.chat_message(message["role"]):
             if show_timestamps and "timestamp" in message:
                 timestamp = message["timestamp"].strftime("%H:%M:%S")
-                st.caption(f"{role_display} - {timestamp}")
+                st.caption(f"{message['role_display']} - {timestamp}")
 
             st.write(message["content"])
 
 # Chat input
 if prompt := st.chat_input(f"Message {assistant_name}..."):
+    # Both bubbles of this turn share one formatted timestamp
+    turn_ts = now.strftime("%H:%M:%S")
+
     # Add user message
-    add_message("user", prompt)
+    add_message("user", prompt, now)
     st.session_state.stats["total_messages"] += 1
 
     # Display user message
     with st.chat_message("user"):
         if show_timestamps:
-            st.caption(f"You - {datetime.now().strftime('%H:%M:%S')}")
+            st.caption(f"You - {turn_ts}")
         st.write(prompt)
 
     # Generate and display assistant response
     with st.chat_message("assistant"):
         if show_timestamps:
-            st.caption(f"{assistant_name} - {datetime.now().strftime('%H:%M:%S')}")
-
-        # Show typing indicator
-        with st.spinner(f"{assistant_name} is thinking..."):
-            time.sleep(random.uniform(0.5, 2.0))  # Realistic delay
+            st.caption(f"{assistant_name} - {turn_ts}")
 
-        # Generate response
+        # Stream the response into a single placeholder so only this bubble updates;
+        # the streamed text is display-only, history keeps the original reply
         response = generate_response(prompt)
-        st.write(response)
-
-        # Add assistant response to history
-        add_message("assistant", response)
+        placeholder = st.empty()
+        streamed = ""
+        for chunk in throttle(stream_response(response)):
+            streamed += chunk
+            placeholder.markdown(streamed)
 
-        # Rerun to update the display
-        st.rerun()
+        # Add assistant response to history; the next rerun picks it up
+        add_message("assistant", response, now)
 
 # Footer with helpful info
 st.write("---")
@@ -235,7 +287,7 @@ with st.expander("ℹ️ About This Demo"):
     - Separation of concerns (UI, logic, data)
     - Consistent error handling and user feedback
 
-    Current session: {len(st.session_state.messages)} messages in {max_history} message limit
+    Current session: {len(st.session_state.messages) + 1} messages in {max_history} message limit
     """)
 
 # Teaching notes for instructors
@@ -278,5 +330,5 @@ with st.expander("🎓 Instructor Notes"):
 # Development info (hidden by default)
 if st.checkbox("Show Development Info", value=False):
     st.write("**Current Session State:**")
-    st.json({k: v for k, v in dict(st.session_state).items() if k not in ["messages"]})
-    st.write(f"**Messages in Memory:** {len(st.session_state.messages)}")
+    st.json({k: st.session_state[k] for k in st.session_state.keys() if k != "messages"})
+    st.write(f"**Messages in Memory:** {len(st.session_state.messages) + 1}")
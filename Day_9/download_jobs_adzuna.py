@@ -3,22 +3,82 @@
 Download job data from Adzuna API and save to JSON format for database ingestion.
 """
 
+import asyncio
 import json
-import requests
+import aiohttp
 import os
+import re
+import textwrap
 from datetime import datetime
+from itertools import islice
 from dotenv import load_dotenv
 
+try:
+    import orjson
+
+    def dump_json(obj) -> str:
+        """Serialize to indented JSON with orjson."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    def dump_json(obj) -> str:
+        """Serialize to indented JSON with the standard library."""
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+
 load_dotenv()
 
-def search_jobs_adzuna(role: str, location: str, num_results: int = 10) -> list:
+# Common technical skills to look for (fixed, so everything below is built once at import)
+SKILLS_KEYWORDS = (
+    'Python', 'Java', 'JavaScript', 'TypeScript', 'React', 'Angular', 'Vue',
+    'Node.js', 'Django', 'Flask', 'Spring', 'Express', 'SQL', 'PostgreSQL',
+    'MongoDB', 'Redis', 'AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes',
+    'Git', 'Linux', 'REST', 'GraphQL', 'Microservices', 'CI/CD',
+    'Machine Learning', 'AI', 'Data Science', 'TensorFlow', 'PyTorch',
+    'Pandas', 'NumPy', 'Scikit-learn', 'HTML', 'CSS', 'Bootstrap',
+    'jQuery', 'Webpack', 'Babel', 'Jest', 'Mocha', 'Selenium'
+)
+MAX_SKILLS = 10
+
+# All keywords compiled into a single case-insensitive, whole-word pattern.
+# ASCII-only matching keeps every match's .lower() a key of SKILL_CANON
+# (Unicode case folding would let e.g. 'Expreſſ' match 'Express').
+SKILL_RE = re.compile(r"\b(?:" + "|".join(map(re.escape, SKILLS_KEYWORDS)) + r")\b", re.IGNORECASE | re.ASCII)
+SKILL_CANON = {skill.lower(): skill for skill in SKILLS_KEYWORDS}
+
+# Case-insensitive search avoids making a lowercased copy of every description
+REMOTE_RE = re.compile("remote", re.IGNORECASE)
+
+# Largest page Adzuna returns for one search request
+ADZUNA_MAX_PAGE_SIZE = 50
+
+# Retry policy for transient Adzuna failures (connection errors, timeouts, 429/5xx)
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.3
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=10)
+
+async def get_json_with_retry(session: aiohttp.ClientSession, url: str, params: dict) -> dict:
+    """GET a JSON document, retrying transient failures with exponential backoff."""
+    for attempt in range(MAX_RETRIES + 1):
+        last_attempt = attempt == MAX_RETRIES
+        try:
+            async with session.get(url, params=params) as response:
+                if last_attempt or response.status not in RETRY_STATUSES:
+                    response.raise_for_status()
+                    return await response.json()
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if last_attempt:
+                raise
+        await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+
+async def search_jobs_adzuna(session: aiohttp.ClientSession, role: str, location: str = "", num_results: int = 10) -> list:
     """
     Search for jobs using Adzuna API.
     
     Args:
+        session: Shared aiohttp session used for the request
         role: Job title or role to search for
-        location: Geographic location for job search
-        num_results: Number of job results to return (default: 10)
+        location: Geographic location for job search (empty searches the whole US)
+        num_results: Number of job results to return (default: 10, at most ADZUNA_MAX_PAGE_SIZE)
     
     Returns:
         List of job dictionaries
@@ -43,22 +103,23 @@ def search_jobs_adzuna(role: str, location: str, num_results: int = 10) -> list:
     params = {
         'app_id': app_id,
         'app_key': api_key,
-        'results_per_page': num_results,
+        'results_per_page': min(num_results, ADZUNA_MAX_PAGE_SIZE),
         'what': role,
-        'where': location,
         'content-type': 'application/json'
     }
+    if location:
+        params['where'] = location
     
     try:
-        print(f"🔍 Searching for '{role}' jobs in '{location}'...")
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        jobs_data = response.json()
+        print(f"🔍 Searching for '{role}' jobs in '{location or 'the US'}'...")
+        jobs_data = await get_json_with_retry(session, url, params)
 
+        today = datetime.now().strftime('%Y-%m-%d')
         job_listings = []
         for job in jobs_data.get('results', []):
             # Extract and clean job data
             job_details = {
+                'adzuna_id': job.get('id'),
                 'title': job.get('title', 'N/A'),
                 'company': job.get('company', {}).get('display_name', 'N/A'),
                 'location': job.get('location', {}).get('display_name', 'N/A'),
@@ -69,19 +130,19 @@ def search_jobs_adzuna(role: str, location: str, num_results: int = 10) -> list:
                 'experience_level': 'Mid-level',  # Default assumption
                 'skills': extract_skills_from_description(job.get('description', '')),
                 'description': job.get('description', 'No description available'),
-                'posted_date': job.get('created', datetime.now().strftime('%Y-%m-%d')),
+                'posted_date': job.get('created', today),
                 'application_url': job.get('redirect_url', 'N/A'),
-                'remote_ok': 1 if 'remote' in job.get('title', '').lower() or 'remote' in job.get('description', '').lower() else 0
+                'remote_ok': 1 if REMOTE_RE.search(job.get('title', '')) or REMOTE_RE.search(job.get('description', '')) else 0
             }
             job_listings.append(job_details)
         
         print(f"✅ Found {len(job_listings)} jobs from Adzuna API")
         return job_listings
         
-    except requests.exceptions.HTTPError as err:
+    except aiohttp.ClientResponseError as err:
         print(f"❌ HTTP Error: {err}")
         return []
-    except requests.exceptions.RequestException as e:
+    except aiohttp.ClientError as e:
         print(f"❌ Request Error: {e}")
         return []
     except Exception as e:
@@ -96,36 +157,56 @@ def extract_skills_from_description(description: str) -> str:
     if not description:
         return ""
     
-    # Common technical skills to look for
-    skills_keywords = [
-        'Python', 'Java', 'JavaScript', 'TypeScript', 'React', 'Angular', 'Vue',
-        'Node.js', 'Django', 'Flask', 'Spring', 'Express', 'SQL', 'PostgreSQL',
-        'MongoDB', 'Redis', 'AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes',
-        'Git', 'Linux', 'REST', 'GraphQL', 'Microservices', 'CI/CD',
-        'Machine Learning', 'AI', 'Data Science', 'TensorFlow', 'PyTorch',
-        'Pandas', 'NumPy', 'Scikit-learn', 'HTML', 'CSS', 'Bootstrap',
-        'jQuery', 'Webpack', 'Babel', 'Jest', 'Mocha', 'Selenium'
-    ]
+    # One regex pass over the text; keep first-seen order and drop repeats
+    found_skills = dict.fromkeys(SKILL_CANON[match.lower()] for match in SKILL_RE.findall(description))
+    return ', '.join(islice(found_skills, MAX_SKILLS))
+
+async def fetch_jobs(search_queries: list):
+    """Run all search queries concurrently and yield each result list as it completes."""
+    connector = aiohttp.TCPConnector(limit=16)
+    async with aiohttp.ClientSession(connector=connector, timeout=REQUEST_TIMEOUT) as session:
+        tasks = [search_jobs_adzuna(session, **query) for query in search_queries]
+        for next_result in asyncio.as_completed(tasks):
+            yield await next_result
+
+async def stream_jobs_to_json(search_queries: list, filename: str = "adzuna_jobs.json") -> int:
+    """
+    Download jobs and write them to a JSON array file as each query completes.
     
-    found_skills = []
-    description_lower = description.lower()
+    Jobs are written one at a time instead of being collected into one big list
+    first. Output goes to a temporary file that only replaces `filename` when at
+    least one job was saved, so a failed run keeps the previous download.
     
-    for skill in skills_keywords:
-        if skill.lower() in description_lower:
-            found_skills.append(skill)
+    Returns:
+        Number of unique jobs saved
+    """
+    temp_filename = f"{filename}.tmp"
+    seen = set()
+    saved = 0
     
-    return ', '.join(found_skills[:10])  # Limit to 10 skills
-
-def save_jobs_to_json(jobs: list, filename: str = "adzuna_jobs.json"):
-    """Save job listings to JSON file for database ingestion."""
     try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(jobs, f, indent=2, ensure_ascii=False)
-        print(f"💾 Saved {len(jobs)} jobs to {filename}")
-        return True
-    except Exception as e:
-        print(f"❌ Error saving jobs to file: {e}")
-        return False
+        with open(temp_filename, 'w', encoding='utf-8') as f:
+            f.write("[")
+            async for jobs in fetch_jobs(search_queries):
+                for job in jobs:
+                    # Skip duplicates (same title and company)
+                    key = (job['title'], job['company'])
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    f.write(",\n" if saved else "\n")
+                    f.write(textwrap.indent(dump_json(job), "  "))
+                    saved += 1
+            f.write("\n]" if saved else "]")
+        
+        if saved:
+            os.replace(temp_filename, filename)
+            print(f"💾 Saved {saved} jobs to {filename}")
+    finally:
+        # Nothing saved or the write failed partway: don't leave the temp file behind
+        if os.path.exists(temp_filename):
+            os.remove(temp_filename)
+    return saved
 
 def main():
     """Main function to download jobs from Adzuna API."""
@@ -133,49 +214,30 @@ def main():
     print("=" * 40)
     
     # Configuration - you can modify these parameters
-    # Note: Adzuna API is configured for US market, so we'll search US locations
-    # but include companies that have Indian operations
+    # Note: Adzuna API is configured for US market, so we'll search US-wide
+    # but include companies that have Indian operations.
+    # Each request has a fixed cost, so ask for one large page per role instead
+    # of several small per-city pages (add a "location" to narrow a search).
     search_queries = [
-        {"role": "Software Engineer", "location": "San Francisco", "num_results": 8},
-        {"role": "Software Engineer", "location": "New York", "num_results": 7},
-        {"role": "Python Developer", "location": "Seattle", "num_results": 8},
-        {"role": "Python Developer", "location": "Austin", "num_results": 7},
-        {"role": "React Developer", "location": "Remote", "num_results": 10},
-        {"role": "Data Scientist", "location": "Boston", "num_results": 8},
-        {"role": "Data Scientist", "location": "Chicago", "num_results": 7},
-        {"role": "DevOps Engineer", "location": "Denver", "num_results": 8},
-        {"role": "DevOps Engineer", "location": "Portland", "num_results": 7}
+        {"role": "Software Engineer", "num_results": ADZUNA_MAX_PAGE_SIZE},
+        {"role": "Python Developer", "num_results": ADZUNA_MAX_PAGE_SIZE},
+        {"role": "React Developer", "num_results": ADZUNA_MAX_PAGE_SIZE},
+        {"role": "Data Scientist", "num_results": ADZUNA_MAX_PAGE_SIZE},
+        {"role": "DevOps Engineer", "num_results": ADZUNA_MAX_PAGE_SIZE}
     ]
     
-    all_jobs = []
-    
-    for query in search_queries:
-        print(f"\n🔍 Searching: {query['role']} in {query['location']}")
-        jobs = search_jobs_adzuna(
-            role=query['role'],
-            location=query['location'],
-            num_results=query['num_results']
-        )
-        all_jobs.extend(jobs)
+    # All queries are network-bound, so issue them at once and save results as they arrive
+    try:
+        total_jobs = asyncio.run(stream_jobs_to_json(search_queries, "adzuna_jobs.json"))
+    except Exception as e:
+        print(f"❌ Error saving jobs to file: {e}")
+        print("❌ Failed to save jobs")
+        return
     
-    if all_jobs:
-        # Remove duplicates based on title and company
-        unique_jobs = []
-        seen = set()
-        for job in all_jobs:
-            key = (job['title'], job['company'])
-            if key not in seen:
-                seen.add(key)
-                unique_jobs.append(job)
-        
-        print(f"\n📊 Total unique jobs found: {len(unique_jobs)}")
-        
-        # Save to JSON file
-        if save_jobs_to_json(unique_jobs, "adzuna_jobs.json"):
-            print("✅ Jobs saved successfully!")
-            print("💡 Next step: Run 'python ingest_jobs_from_json.py' to load into database")
-        else:
-            print("❌ Failed to save jobs")
+    if total_jobs:
+        print(f"\n📊 Total unique jobs found: {total_jobs}")
+        print("✅ Jobs saved successfully!")
+        print("💡 Next step: Run 'python ingest_jobs_from_json.py' to load into database")
     else:
         print("❌ No jobs found. Check your API credentials and try again.")
 
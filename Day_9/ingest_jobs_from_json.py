@@ -3,18 +3,60 @@
 Script to ingest job data from JSON file (from Adzuna API) into SQLite database.
 """
 
+import argparse
 import sqlite3
 import json
 import os
+import re
 from datetime import datetime
 
-def create_jobs_database():
-    """Create the jobs database and table."""
+# orjson is much faster at parsing; its JSONDecodeError subclasses the stdlib one
+try:
+    from orjson import loads as load_json
+except ImportError:
+    from json import loads as load_json
+
+# Adzuna ad id inside redirect URLs such as /land/ad/<id> or /details/<id>
+AD_ID_RE = re.compile(r"/(?:ad|details)/(\d+)")
+
+def job_key(job):
+    """
+    Return a stable identity for a job across downloads.
+    
+    Redirect URLs carry per-search tokens (se=, v=), so the URL itself changes
+    between downloads. The Adzuna ad id is used when known, then the URL without
+    its query string, and finally title and company (the downloader's own
+    duplicate rule) for jobs without a usable URL.
+    """
+    if job.get('adzuna_id'):
+        return f"adzuna:{job['adzuna_id']}"
+    url = job.get('application_url') or ''
+    match = AD_ID_RE.search(url)
+    if match:
+        return f"adzuna:{match.group(1)}"
+    url = url.split('?', 1)[0]
+    if url and url != 'N/A':
+        return url
+    return f"{job.get('title', 'N/A')}|{job.get('company', 'N/A')}"
+
+def create_jobs_database(rebuild=False):
+    """Create the jobs database and table, dropping existing data if rebuild is set."""
     conn = sqlite3.connect('jobs.db')
     cursor = conn.cursor()
 
-    # Drop existing table
-    cursor.execute("DROP TABLE IF EXISTS `jobs`")
+    if rebuild:
+        # Bulk-load settings: the table is rebuilt from JSON, so a crash
+        # mid-load is recovered by simply rerunning the ingest. With the
+        # journal off a failed load can't be reliably rolled back either, so
+        # a --rebuild that fails partway may leave a partial table
+        cursor.execute("PRAGMA journal_mode=OFF")
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-200000")
+
+        # Drop existing tables
+        cursor.execute("DROP TABLE IF EXISTS `jobs_fts`")
+        cursor.execute("DROP TABLE IF EXISTS `jobs`")
     
     # Create jobs table
     query_create = """
@@ -32,16 +74,50 @@ def create_jobs_database():
         `description` TEXT,
         `posted_date` TEXT,
         `application_url` TEXT,
-        `remote_ok` INTEGER DEFAULT 0
+        `remote_ok` INTEGER DEFAULT 0,
+        `job_key` TEXT NOT NULL
     );
     """
     
     cursor.execute(query_create)
+
+    # CREATE TABLE IF NOT EXISTS leaves an older table as it is
+    columns = {row[1] for row in cursor.execute("PRAGMA table_info(`jobs`)")}
+    if 'job_key' not in columns:
+        conn.close()
+        raise sqlite3.OperationalError("jobs table predates the job_key column")
+
+    # job_key identifies a job across downloads (see job_key())
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS `idx_job_key` ON `jobs` (`job_key`)")
+
+    # Indexes for the MCP server's filters, sorting and GROUP BY statistics
+    cursor.execute("CREATE INDEX IF NOT EXISTS `idx_company` ON `jobs` (`company`)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS `idx_location` ON `jobs` (`location`)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS `idx_posted` ON `jobs` (`posted_date` DESC)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS `idx_remote` ON `jobs` (`remote_ok`)")
+
+    # Full-text index over the searchable text columns, backed by the jobs table
+    fts_exists = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='jobs_fts'"
+    ).fetchone()
+    cursor.execute("""
+    CREATE VIRTUAL TABLE IF NOT EXISTS `jobs_fts` USING fts5(
+        title, description, skills, content='jobs', content_rowid='id'
+    );
+    """)
+    if not fts_exists:
+        # Index any rows already in a database created before the FTS table
+        cursor.execute("INSERT INTO `jobs_fts` (`jobs_fts`) VALUES ('rebuild')")
     conn.commit()
     return conn, cursor
 
-def ingest_jobs_from_json(json_file='adzuna_jobs.json'):
-    """Read jobs from JSON file and insert into database."""
+def ingest_jobs_from_json(json_file='adzuna_jobs.json', rebuild=False):
+    """
+    Read jobs from JSON file and insert into database.
+    
+    Jobs whose job_key is already stored are skipped, so repeated runs only
+    add new listings. Pass rebuild=True to drop and recreate the table.
+    """
     if not os.path.exists(json_file):
         print(f"❌ Error: {json_file} not found!")
         print("💡 Run 'python download_jobs_adzuna.py' first to fetch jobs from Adzuna API")
@@ -49,55 +125,71 @@ def ingest_jobs_from_json(json_file='adzuna_jobs.json'):
     
     try:
         # Read JSON file
-        with open(json_file, 'r', encoding='utf-8') as f:
-            jobs_data = json.load(f)
+        with open(json_file, 'rb') as f:
+            jobs_data = load_json(f.read())
         
         print(f"📄 Found {len(jobs_data)} jobs in {json_file}")
         
         # Create database
-        conn, cursor = create_jobs_database()
+        conn, cursor = create_jobs_database(rebuild)
+        
+        # Build all rows up front, then insert them in one executemany call
+        today = datetime.now().strftime('%Y-%m-%d')
+        rows = [
+            (
+                job.get('title', 'N/A'),
+                job.get('company', 'N/A'),
+                job.get('location', 'N/A'),
+                job.get('salary_min'),
+                job.get('salary_max'),
+                job.get('salary_currency', 'USD'),
+                job.get('employment_type', 'Full-time'),
+                job.get('experience_level', 'Mid-level'),
+                job.get('skills', ''),
+                job.get('description', ''),
+                job.get('posted_date') or today,
+                # The downloader writes 'N/A' for a missing URL; store NULL instead
+                None if job.get('application_url') in (None, '', 'N/A') else job['application_url'],
+                job.get('remote_ok', 0),
+                job_key(job)
+            )
+            for job in jobs_data
+        ]
         
-        # Insert jobs
-        inserted_count = 0
-        for job in jobs_data:
-            try:
-                data = [
-                    job.get('title', 'N/A'),
-                    job.get('company', 'N/A'),
-                    job.get('location', 'N/A'),
-                    job.get('salary_min'),
-                    job.get('salary_max'),
-                    job.get('salary_currency', 'USD'),
-                    job.get('employment_type', 'Full-time'),
-                    job.get('experience_level', 'Mid-level'),
-                    job.get('skills', ''),
-                    job.get('description', ''),
-                    job.get('posted_date', datetime.now().strftime('%Y-%m-%d')),
-                    job.get('application_url', ''),
-                    job.get('remote_ok', 0)
-                ]
-                
-                cursor.execute("""
-                    INSERT INTO `jobs` (
-                        `title`, `company`, `location`, `salary_min`, `salary_max`, 
-                        `salary_currency`, `employment_type`, `experience_level`, 
-                        `skills`, `description`, `posted_date`, `application_url`, `remote_ok`
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, data)
-                inserted_count += 1
-                
-            except Exception as e:
-                print(f"⚠️  Error inserting job '{job.get('title', 'Unknown')}': {e}")
-                continue
+        # Single transaction: one commit for the whole load
+        with conn:
+            last_id = cursor.execute("SELECT COALESCE(MAX(`id`), 0) FROM `jobs`").fetchone()[0]
+            cursor.executemany("""
+                INSERT OR IGNORE INTO `jobs` (
+                    `title`, `company`, `location`, `salary_min`, `salary_max`, 
+                    `salary_currency`, `employment_type`, `experience_level`, 
+                    `skills`, `description`, `posted_date`, `application_url`, `remote_ok`,
+                    `job_key`
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            inserted_count = cursor.rowcount
+            
+            # Index only the rows added by this run
+            cursor.execute("""
+                INSERT INTO `jobs_fts` (`rowid`, `title`, `description`, `skills`)
+                SELECT `id`, `title`, `description`, `skills` FROM `jobs` WHERE `id` > ?
+            """, (last_id,))
         
-        conn.commit()
+        # journal_mode is stored in the database file, so this replaces the
+        # bulk-load OFF setting for later connections such as the MCP server's
+        cursor.execute("PRAGMA journal_mode=WAL")
         conn.close()
-        print(f"✅ Successfully ingested {inserted_count} jobs into the database!")
+        print(f"✅ Successfully ingested {inserted_count} new jobs into the database!")
         return True
         
     except json.JSONDecodeError as e:
         print(f"❌ Error parsing JSON file: {e}")
         return False
+    except sqlite3.OperationalError as e:
+        # Most often a jobs table created before the current schema
+        print(f"❌ Database error: {e}")
+        print("💡 If the schema changed, run 'python ingest_jobs_from_json.py --rebuild' to recreate the database")
+        return False
     except Exception as e:
         print(f"❌ Error reading file: {e}")
         return False
@@ -135,11 +227,16 @@ def verify_database():
         return False
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest Adzuna jobs from JSON into SQLite.")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="drop and recreate the jobs table instead of adding new jobs only")
+    args = parser.parse_args()
+    
     print("🗄️  Job Database Ingestion from Adzuna JSON")
     print("=" * 50)
     
     # Ingest jobs from JSON
-    success = ingest_jobs_from_json()
+    success = ingest_jobs_from_json(rebuild=args.rebuild)
     
     if success:
         print("\n🔍 Verifying database...")
@@ -1,14 +1,75 @@
 from dotenv import load_dotenv
+import functools
 import os
 import sqlite3
+import threading
+import time
 from mcp.server.fastmcp import FastMCP
 
+try:
+    from orjson import loads as load_json
+except ImportError:
+    from json import loads as load_json
+
 load_dotenv()
 
 
 # Create an MCP server
 mcp = FastMCP("JobSearchServer")
 
+DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "jobs.db")
+
+# One connection shared by every tool call, so the database is opened once and
+# sqlite3's per-connection statement cache is reused. Tools may run on worker
+# threads, so access goes through _DB_LOCK.
+_conn = None
+_DB_LOCK = threading.Lock()
+
+# Explicit column list so results don't depend on the table's column order
+JOB_FIELDS = (
+    "id", "title", "company", "location", "salary_min", "salary_max", "salary_currency",
+    "employment_type", "experience_level", "skills", "description", "posted_date",
+    "application_url", "remote_ok"
+)
+JOB_COLUMNS = ", ".join(JOB_FIELDS)
+# Same columns serialized by SQLite itself, one JSON object per row
+JOB_JSON_OBJECT = "json_object(" + ", ".join(f"'{field}', {field}" for field in JOB_FIELDS) + ")"
+
+
+def get_connection() -> sqlite3.Connection:
+    """Return the shared database connection, opening it on first use (hold _DB_LOCK)."""
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+        _conn.row_factory = sqlite3.Row
+    return _conn
+
+
+STATS_TTL_SECONDS = 60
+
+# Job statistics as (kind, name, count) rows; the top-10 lists are wrapped in
+# subqueries because compound SELECT members can't have their own ORDER BY/LIMIT
+STATS_QUERY = """
+    SELECT 'total' AS kind, NULL AS name, COUNT(*) AS count FROM jobs
+    UNION ALL
+    SELECT 'remote', NULL, COUNT(*) FROM jobs WHERE remote_ok = 1
+    UNION ALL
+    SELECT * FROM (
+        SELECT 'location', location, COUNT(*) AS count
+        FROM jobs
+        GROUP BY location
+        ORDER BY count DESC
+        LIMIT 10
+    )
+    UNION ALL
+    SELECT * FROM (
+        SELECT 'company', company, COUNT(*) AS count
+        FROM jobs
+        GROUP BY company
+        ORDER BY count DESC
+        LIMIT 10
+    )
+"""
 
 
 @mcp.tool()
@@ -22,18 +83,26 @@ def search_jobs(keywords: str = "", location: str = "", company: str = "", limit
         company: Company name to filter by
         limit: Maximum number of results to return (default: 10)
     """
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    db_path = os.path.join(base_dir, "jobs.db")
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-
     # Build dynamic query based on provided parameters
-    query = "SELECT * FROM jobs WHERE 1=1"
+    query = f"SELECT {JOB_JSON_OBJECT} FROM jobs WHERE 1=1"
     params = []
     
-    if keywords:
+    # The FTS tokenizer drops symbols, so "C++", ".NET" or a bare "+" would turn
+    # into a much broader token (or none at all); those words keep the LIKE scan.
+    # Whitespace-only keywords leave no words and so add no filter.
+    words = keywords.split()
+    fts_words = [word for word in words if word.isalnum()]
+    like_words = [word for word in words if not word.isalnum()]
+
+    if fts_words:
+        # Full-text lookup; each word is quoted so user input can't break the
+        # FTS5 query syntax, and prefix-matched unless it's a single character
+        query += " AND id IN (SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH ?)"
+        params.append(" ".join(f'"{word}"' + ("*" if len(word) > 1 else "") for word in fts_words))
+
+    for word in like_words:
         query += " AND (title LIKE ? OR description LIKE ? OR skills LIKE ?)"
-        keyword_param = f"%{keywords}%"
+        keyword_param = f"%{word}%"
         params.extend([keyword_param, keyword_param, keyword_param])
     
     if location:
@@ -47,31 +116,12 @@ def search_jobs(keywords: str = "", location: str = "", company: str = "", limit
     query += " ORDER BY posted_date DESC LIMIT ?"
     params.append(limit)
 
-    result = cursor.execute(query, params)
-    jobs = result.fetchall()
-
-    conn.close()
+    with _DB_LOCK:
+        jobs = get_connection().execute(query, params).fetchall()
 
     if jobs:
-        job_list = []
-        for job in jobs:
-            job_data = {
-                "id": job[0],
-                "title": job[1],
-                "company": job[2],
-                "location": job[3],
-                "salary_min": job[4],
-                "salary_max": job[5],
-                "salary_currency": job[6],
-                "employment_type": job[7],
-                "experience_level": job[8],
-                "skills": job[9],
-                "description": job[10],
-                "posted_date": job[11],
-                "application_url": job[12],
-                "remote_ok": job[13]
-            }
-            job_list.append(job_data)
+        # Rows are already JSON objects; parse them as one array in a single call
+        job_list = load_json("[" + ",".join(job[0] for job in jobs) + "]")
         
         return {
             "total_results": len(job_list),
@@ -89,33 +139,11 @@ def get_job_by_id(job_id: int) -> dict:
     Args:
         job_id: The unique ID of the job
     """
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    db_path = os.path.join(base_dir, "jobs.db")
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-
-    result = cursor.execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
-    job = result.fetchone()
-
-    conn.close()
+    with _DB_LOCK:
+        job = get_connection().execute(f"SELECT {JOB_COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
 
     if job:
-        return {
-            "id": job[0],
-            "title": job[1],
-            "company": job[2],
-            "location": job[3],
-            "salary_min": job[4],
-            "salary_max": job[5],
-            "salary_currency": job[6],
-            "employment_type": job[7],
-            "experience_level": job[8],
-            "skills": job[9],
-            "description": job[10],
-            "posted_date": job[11],
-            "application_url": job[12],
-            "remote_ok": job[13]
-        }
+        return dict(job)
     else:
         return {"error": f"No job found with ID {job_id}."}
 
@@ -125,42 +153,33 @@ def get_job_statistics() -> dict:
     """
     Get statistics about available jobs in the database.
     """
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    db_path = os.path.join(base_dir, "jobs.db")
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+    # Statistics barely change between calls, so serve them from a cache that
+    # expires every STATS_TTL_SECONDS
+    return _job_statistics(int(time.time() // STATS_TTL_SECONDS))
 
-    # Get total job count
-    total_jobs = cursor.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
-    
-    # Get jobs by location
-    location_stats = cursor.execute("""
-        SELECT location, COUNT(*) as count 
-        FROM jobs 
-        GROUP BY location 
-        ORDER BY count DESC 
-        LIMIT 10
-    """).fetchall()
-    
-    # Get jobs by company
-    company_stats = cursor.execute("""
-        SELECT company, COUNT(*) as count 
-        FROM jobs 
-        GROUP BY company 
-        ORDER BY count DESC 
-        LIMIT 10
-    """).fetchall()
-    
-    # Get remote jobs count
-    remote_jobs = cursor.execute("SELECT COUNT(*) FROM jobs WHERE remote_ok = 1").fetchone()[0]
 
-    conn.close()
+@functools.lru_cache(maxsize=1)
+def _job_statistics(time_bucket: int) -> dict:
+    """Compute job statistics; time_bucket only keys the cache."""
+    # All four statistics in one statement, tagged by kind
+    with _DB_LOCK:
+        rows = get_connection().execute(STATS_QUERY).fetchall()
+
+    stats = {"total": [], "remote": [], "location": [], "company": []}
+    for row in rows:
+        stats[row["kind"]].append(row)
 
     return {
-        "total_jobs": total_jobs,
-        "remote_jobs": remote_jobs,
-        "top_locations": [{"location": loc[0], "count": loc[1]} for loc in location_stats],
-        "top_companies": [{"company": comp[0], "count": comp[1]} for comp in company_stats]
+        "total_jobs": stats["total"][0]["count"],
+        "remote_jobs": stats["remote"][0]["count"],
+        "top_locations": [
+            {"location": row["name"], "count": row["count"]}
+            for row in sorted(stats["location"], key=lambda row: row["count"], reverse=True)
+        ],
+        "top_companies": [
+            {"company": row["name"], "count": row["count"]}
+            for row in sorted(stats["company"], key=lambda row: row["count"], reverse=True)
+        ]
     }
     
 